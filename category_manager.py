@@ -1,38 +1,90 @@
 # category_manager.py
 
-import os
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+_log = logging.getLogger(__name__)
 
 CATEGORY_FILE = 'categories.txt'
-DEFAULT_CATEGORIES = ['餐飲', '交通', '購物', '娛樂', '居家', '雜項']
+_CATEGORY_PATH = Path(CATEGORY_FILE)
+DEFAULT_CATEGORIES = ('交通', '娛樂', '居家', '購物', '雜項', '餐飲') # 已排序的不可變常數
+_DEFAULT_CATEGORY_SET = frozenset(DEFAULT_CATEGORIES)
+
+@lru_cache(maxsize=4)
+def _load_cached(mtime_ns, size):
+    """
+    實際讀取並解析 categories.txt，回傳 (排序後的 tuple, frozenset)。
+    以檔案的 (st_mtime_ns, st_size) 為快取鍵，檔案未變動時不重新讀檔。
+    """
+    text = _CATEGORY_PATH.read_bytes().decode('utf-8')
+    categories = filter(None, map(str.strip, text.splitlines()))
+    result = tuple(sorted(categories))
+    return result, frozenset(result)
+
+def _load_categories_views():
+    """取得類別的 (tuple, frozenset)；檔案不存在或讀取失敗時回傳預設類別"""
+    try:
+        st = _CATEGORY_PATH.stat()
+    except FileNotFoundError:
+        save_categories(DEFAULT_CATEGORIES, validated=True)
+        return DEFAULT_CATEGORIES, _DEFAULT_CATEGORY_SET
+
+    # 只攔截讀檔/解碼錯誤，其他非預期錯誤直接拋出，避免以預設值覆蓋正常資料
+    try:
+        return _load_cached(st.st_mtime_ns, st.st_size)
+    except (UnicodeDecodeError, OSError) as e:
+        _log.error("讀取類別檔案時發生錯誤: %s", e)
+        return DEFAULT_CATEGORIES, _DEFAULT_CATEGORY_SET
 
 def load_categories():
     """
-    從 categories.txt 讀取類別列表。
+    從 categories.txt 讀取類別列表 (回傳排序後的 tuple)。
     如果檔案不存在，則建立並寫入預設類別。
+    檔案未變動時直接回傳快取內容，不重新讀檔。
     """
-    if not os.path.exists(CATEGORY_FILE):
-        save_categories(DEFAULT_CATEGORIES)
-        return DEFAULT_CATEGORIES
-    
-    try:
-        with open(CATEGORY_FILE, 'r', encoding='utf-8') as f:
-            categories = [line.strip() for line in f if line.strip()]
-        return sorted(categories)
-    except Exception as e:
-        print(f"讀取類別檔案時發生錯誤: {e}")
-        return DEFAULT_CATEGORIES
+    return _load_categories_views()[0]
+
+def load_categories_set():
+    """
+    回傳類別的 frozenset，供呼叫端以 O(1) 進行成員檢查。
+    與 load_categories() 共用同一份快取。
+    """
+    return _load_categories_views()[1]
+
+def _already_sorted_unique(xs):
+    """檢查序列是否已嚴格遞增 (即已排序且無重複)"""
+    return all(xs[i] < xs[i + 1] for i in range(len(xs) - 1))
+
+def _atomic_write_bytes(path, data):
+    """
+    以單次寫入將整份資料寫到暫存檔，再以 Path.replace 原子性地取代目標檔案，
+    避免中途失敗留下不完整的檔案。
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb', buffering=131072) as f:
+        # 單次寫入，關閉檔案時由 OS 緩衝處理；請勿改成逐行寫入或加入 f.flush()/os.fsync()
+        f.write(data)
+    tmp_path.replace(path)
 
-def save_categories(categories):
+def save_categories(categories, *, validated=False):
     """
-    將類別列表儲存到 categories.txt。
+    將類別儲存到 categories.txt。
+    categories 可為任何可迭代物件 (list、tuple、set、generator 等)，
+    會自動去除重複並排序後寫入。
+    若呼叫端保證 categories 已排序且無重複，可傳入 validated=True 略過整理步驟。
     """
     try:
         # 確保列表中的項目是獨一無二且排序過的
-        unique_sorted_categories = sorted(list(set(categories)))
-        with open(CATEGORY_FILE, 'w', encoding='utf-8') as f:
-            for category in unique_sorted_categories:
-                f.write(f"{category}\n")
+        if validated or (isinstance(categories, (list, tuple)) and _already_sorted_unique(categories)):
+            unique_sorted_categories = categories
+        else:
+            unique_sorted_categories = sorted(dict.fromkeys(categories))
+        # 類別數量很少，一次 join 後單次寫入比 writelines 逐項寫入更快
+        data = ('\n'.join(unique_sorted_categories) + '\n').encode('utf-8')
+        _atomic_write_bytes(_CATEGORY_PATH, data)
+        _load_cached.cache_clear() # 寫入後使快取失效
         return True
     except Exception as e:
-        print(f"儲存類別檔案時發生錯誤: {e}")
+        _log.error("儲存類別檔案時發生錯誤: %s", e)
         return False
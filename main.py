@@ -1,17 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import bisect
 import csv
 import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from collections import defaultdict
+import io
+import itertools
+import mmap
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import platform
 import os
 import shutil
 import re
 import subprocess
-from PIL import Image
-import pytesseract
 from category_manager import load_categories, save_categories
 
 
@@ -23,18 +25,19 @@ except ImportError:
     CALENDAR_ENABLED = False
     DateEntry = None # Placeholder so the rest of the code doesn't crash on reference
 
-# --- Tesseract 設定 ---
-# 如果 Tesseract 沒有被自動偵測到，請取消下方註解並提供您的 tesseract.exe 的完整路徑
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-
 # --- 全域設定 ---
 CSV_FILE = 'records.csv'
+MIGRATED_SENTINEL = CSV_FILE + '.migrated' # 存在時代表 CSV 已是新版格式，啟動時略過遷移檢查 (read_records() 讀到舊版標頭時仍會重新遷移)
 INVOICE_DIR = 'invoices'
+INVOICE_COPY_POLL_MS = 50 # 主執行緒檢查背景圖片複製是否完成的間隔
 HEADERS = ['日期', '類型', '類別', '金額', '備註', '圖片']
+# 一筆紀錄，欄位順序與 HEADERS 相同 (金額為 float)
+Record = namedtuple('Record', HEADERS)
 
 # --- Matplotlib 中文字體設定 ---
 def set_chinese_font():
     """根據作業系統設定 Matplotlib 的中文字體"""
+    import matplotlib
     system = platform.system()
     if system == 'Windows':
         font_name = 'Microsoft JhengHei'
@@ -44,11 +47,167 @@ def set_chinese_font():
         font_name = 'WenQuanYi Zen Hei'
     
     try:
-        plt.rcParams['font.sans-serif'] = [font_name]
-        plt.rcParams['axes.unicode_minus'] = False
+        # 指定明確的字體清單 (含常見的 Noto CJK 備援)，避免 findfont 在找不到時逐一探測
+        matplotlib.rcParams['font.sans-serif'] = [font_name, 'Noto Sans CJK TC', 'DejaVu Sans']
+        matplotlib.rcParams['axes.unicode_minus'] = False
     except Exception as e:
         print(f"⚠️ 警告：設定字體失敗: {e}。中文可能無法正常顯示。  ")
 
+# --- 延遲載入 ---
+# matplotlib、NumPy 與 PIL 載入成本高，等到第一次使用時才匯入，讓主視窗先顯示
+_matplotlib_ready = False
+
+def ensure_matplotlib():
+    """
+    第一次繪圖前匯入 matplotlib 並設定中文字體。
+    只在繪圖執行緒 (單一 worker) 上呼叫，因此旗標與 rcParams 的設定不需加鎖，也不會佔用 Tk 主執行緒。
+    """
+    global _matplotlib_ready
+    if not _matplotlib_ready:
+        set_chinese_font()
+        _matplotlib_ready = True
+
+def warm_up_matplotlib():
+    """
+    在背景執行緒預先匯入 matplotlib 並繪製一次中文字，
+    讓字體查找結果先進入快取，第一次繪製圖表時不必再探測字體。
+    """
+    ensure_matplotlib()
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(1, 1), dpi=CHART_DPI)
+    canvas = FigureCanvasAgg(fig)
+    fig.text(0, 0, '預熱')
+    canvas.draw()
+
+# --- 圖表繪製 (背景執行緒) ---
+# 以下函式只使用 Figure + FigureCanvasAgg (不經過 pyplot)，可在背景執行緒中安全地點陣化，
+# 回傳 RGBA 像素陣列，再由主執行緒換到畫面上。
+# Figure 不會登記到 pyplot 的全域管理器，不再使用時即可被回收，不需 plt.close()；
+# 請勿在此模組匯入 matplotlib.pyplot。
+CHART_DPI = 100
+CHART_POLL_MS = 30 # 主執行緒檢查背景繪圖是否完成的間隔
+CHART_RESIZE_DELAY_MS = 200 # 圖表區域大小改變後，停止變動這麼久才重新繪製
+
+# 每種圖表各保留一組 (Figure, Axes, FigureCanvasAgg) 重複使用；
+# 只有單一背景執行緒會繪圖，因此不需加鎖
+_chart_figures = {}
+
+def _chart_figure(kind, size):
+    """
+    取得 kind 圖表可重複使用的 (fig, ax, canvas, is_new)，清空座標軸後回傳；大小改變時才重新建立。
+    is_new 為 True 表示剛建立，呼叫端只在此時計算一次版面配置。
+    """
+    cached = _chart_figures.get(kind)
+    if cached is not None and cached[0] == size:
+        _, fig, ax, canvas = cached
+        ax.clear() # 只清除座標軸內容，tight_layout 決定的邊界會保留下來
+        return fig, ax, canvas, False
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(size[0] / CHART_DPI, size[1] / CHART_DPI), dpi=CHART_DPI)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    _chart_figures[kind] = (size, fig, ax, canvas)
+    return fig, ax, canvas, True
+
+def _figure_to_rgba(canvas):
+    """將畫布以 Agg 點陣化並回傳 RGBA 像素陣列 (複製一份，畫布之後會被重複使用)"""
+    import numpy as np
+
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+def render_pie_chart(labels, values, size):
+    """繪製各類別支出圓餅圖"""
+    ensure_matplotlib()
+    fig, ax, canvas, is_new = _chart_figure('pie', size)
+    # 百分比直接併入類別標籤，不使用 autopct，每個扇形只需繪製一個文字物件
+    total = sum(values)
+    labels = [f"{label}\n{value * 100 / total:.1f}%" for label, value in zip(labels, values)]
+    ax.pie(values, labels=labels, startangle=140, textprops={'fontsize': 10})
+    ax.set_title('各類別支出圓餅圖', fontsize=16)
+    ax.axis('equal')
+    if is_new:
+        fig.tight_layout()
+    return _figure_to_rgba(canvas)
+
+def render_bar_chart(months, income_values, expense_values, size):
+    """繪製每月收支趨勢長條圖"""
+    import numpy as np
+
+    ensure_matplotlib()
+    fig, ax, canvas, is_new = _chart_figure('bar', size)
+
+    bar_width = 0.35
+    x = np.arange(len(months))
+    
+    ax.bar(x - bar_width/2, income_values, bar_width, label='收入', color='g')
+    ax.bar(x + bar_width/2, expense_values, bar_width, label='支出', color='r')
+
+    ax.set_ylabel('金額')
+    ax.set_title('每月收支趨勢圖')
+    ax.set_xticks(x, labels=months, rotation=45, ha="right")
+    ax.legend()
+
+    if is_new:
+        fig.tight_layout()
+        # 之後的月份標籤數量可能增加，底部至少保留 20% 給旋轉後的標籤
+        fig.subplots_adjust(bottom=max(fig.subplotpars.bottom, 0.2))
+    return _figure_to_rgba(canvas)
+
+# --- 日期解析 ---
+DATE_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})', re.ASCII)
+
+def parse_date(date_str):
+    """
+    解析 'YYYY-MM-DD' 格式的日期字串並回傳 datetime.date。
+    以預先編譯的正規表示式取代 strptime；格式或日期不合法時拋出 ValueError。
+    """
+    match = DATE_PATTERN.fullmatch(date_str)
+    if match is None:
+        raise ValueError(f"日期格式錯誤: {date_str!r}")
+    year, month, day = match.groups()
+    return datetime.date(int(year), int(month), int(day))
+
+def _date_key(date_str):
+    """
+    回傳紀錄日期用於排序與範圍查詢的鍵。補零的 'YYYY-MM-DD' 直接使用原字串；
+    舊版儲存的未補零日期 (如 '2025-1-20') 先正規化，字串比較才會等於日期比較。無法解析時保留原字串。
+    """
+    if len(date_str) == 10:
+        return date_str
+    try:
+        return parse_date(date_str).isoformat()
+    except ValueError:
+        return date_str
+
+def _parse_ymd(s):
+    """
+    嚴格解析固定寬度的 'YYYY-MM-DD' 日期字串並回傳 datetime.date，供儲存紀錄時驗證使用。
+    直接以切片與 int() 取值；格式或日期不合法時拋出 ValueError。
+    儲存的日期必須補零，依字串排序才會等於依日期排序。
+    """
+    if len(s) != 10 or not s.isascii() or s[4] != '-' or s[7] != '-' or not (s[:4] + s[5:7] + s[8:]).isdigit():
+        raise ValueError(f"日期格式錯誤: {s!r}")
+    return datetime.date(int(s[:4]), int(s[5:7]), int(s[8:]))
+
+# --- 金額解析 ---
+# \d 不限 ASCII：輸入法常打出全形數字 (如 '１２')，float() 也接受這類十進位數字
+AMOUNT_PATTERN = re.compile(r'-?(?:\d+(?:\.\d*)?|\.\d+)')
+
+def parse_amount(amount_str):
+    """
+    以預先編譯的正規表示式檢查金額格式後轉為 float；格式不符時回傳 None，不需 try/except。
+    只接受一般的十進位數字 (可有負號)，科學記號、inf、nan 等都視為無效。
+    """
+    if AMOUNT_PATTERN.fullmatch(amount_str) is None:
+        return None
+    return float(amount_str)
+
 # --- 資料遷移與初始化 ---
 def migrate_csv_if_needed():
     """檢查 CSV 格式是否為舊版，如果是，則遷移到新格式"""
@@ -73,21 +232,22 @@ def migrate_csv_if_needed():
                 for row in reader:
                     old_records.append(row)
 
-            with open(CSV_FILE, 'w', encoding='utf-8', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=HEADERS)
-                writer.writeheader()
-                for record in old_records:
-                    new_record = {
-                        '日期': record.get('日期'),
-                        '類型': record.get('類型', '支出'), # 如果沒有'類型'欄位，預設為'支出'
-                        '類別': record.get('類別'),
-                        '金額': record.get('金額'),
-                        '備註': record.get('備註'),
-                        '圖片': record.get('圖片', '') # 新增圖片欄位，預設為空
-                    }
-                    writer.writerow(new_record)
+            new_records = []
+            for record in old_records:
+                new_records.append(Record(
+                    record.get('日期'),
+                    record.get('類型', '支出'), # 如果沒有'類型'欄位，預設為'支出'
+                    record.get('類別'),
+                    record.get('金額'),
+                    record.get('備註'),
+                    record.get('圖片', '') # 新增圖片欄位，預設為空
+                ))
+            write_all_records(new_records)
             messagebox.showinfo("資料遷移", f"您的資料已成功更新到新格式！\n舊檔案已備份至 {backup_path}")
 
+        # 標頭已是新版 (或剛完成遷移)，建立標記檔讓之後的啟動略過此檢查
+        open(MIGRATED_SENTINEL, 'wb').close()
+
     except Exception as e:
         messagebox.showerror("遷移錯誤", f"資料遷移失敗: {e}")
         return False
@@ -107,32 +267,319 @@ def init_csv():
     return True
 
 # --- 資料讀取/寫入功能 ---
+# 紀錄快取：以 (st_mtime_ns, st_size) 為鍵，檔案未變動時不重新解析。
+# spans 與 data 一一對應，記錄每筆紀錄在檔案中的 (起點, 終點) 位元組位置；
+# rows 以 id(紀錄) 對應到索引，讓編輯/刪除可直接定位到該列。
+# by_date 為依日期遞增排序的紀錄 (同日期者依檔案順序倒置)，dates 為其對應的日期鍵 (_date_key())，供 bisect 做範圍查詢。
+_records_cache = {'key': None, 'data': None, 'spans': None, 'rows': None, 'by_date': None, 'dates': None, 'arrays': None}
+
+def invalidate_records_cache():
+    """寫入 CSV 後呼叫，強制下次讀取時重新解析"""
+    _records_cache['key'] = None
+    _records_cache['data'] = None
+    _records_cache['spans'] = None
+    _records_cache['rows'] = None
+    _records_cache['by_date'] = None
+    _records_cache['dates'] = None
+    _records_cache['arrays'] = None
+    # 檔案內容改變但 (mtime, size) 可能不變 (同長度的修改、mtime 精度低的檔案系統)，統計快取也一併清除
+    _summarize_range_cached.cache_clear()
+
+def _csv_file_key():
+    """回傳 CSV 檔案目前的快取鍵 (st_mtime_ns, st_size)"""
+    st = os.stat(CSV_FILE)
+    return (st.st_mtime_ns, st.st_size)
+
 def read_records():
-    """讀取所有紀錄"""
+    """讀取所有紀錄 (檔案未變動時直接回傳快取，呼叫端請勿修改回傳的紀錄)"""
     try:
-        with open(CSV_FILE, 'r', encoding='utf-8', newline='') as file:
-            reader = csv.DictReader(file)
-            records = [row for row in reader if any(row.values())]
-        for record in records:
-            record['金額'] = float(record['金額'])
+        key = _csv_file_key()
+        if key == _records_cache['key']:
+            return _records_cache['data']
+
+        with open(CSV_FILE, 'rb') as file:
+            lines = file.read().splitlines(keepends=True)
+        # 每一實體行的起始位元組位置，用來換算每筆紀錄的範圍
+        offsets = [0]
+        offsets.extend(itertools.accumulate(len(line) for line in lines))
+
+        # 以 csv.reader 依欄位位置取值，省去 DictReader 每列建立 dict 的成本
+        reader = csv.reader(line.decode('utf-8') for line in lines)
+        records = []
+        spans = []
+        header = next(reader, None) # 先讀入標頭，之後的 line_num 即為各筆紀錄的結束行
+        width = len(HEADERS)
+        if header is not None and len(header) < width:
+            # 標記檔存在但檔案又是舊版格式 (例如還原了遷移前的備份)：移除標記後重新遷移，
+            # 否則依欄位位置取值會把舊版的欄位讀錯
+            try:
+                os.remove(MIGRATED_SENTINEL)
+            except FileNotFoundError:
+                pass
+            invalidate_records_cache()
+            return read_records() if migrate_csv_if_needed() else []
+        prev_line = reader.line_num
+        for row in reader:
+            start, prev_line = offsets[prev_line], reader.line_num
+            if not any(row):
+                continue
+            if len(row) != width:
+                row = (row + [''] * width)[:width] # 欄位數不符時補空字串或截斷
+            records.append(Record(row[0], row[1], row[2], float(row[3]), row[4], row[5]))
+            spans.append((start, offsets[prev_line]))
+
+        _records_cache['key'] = key
+        _records_cache['data'] = records
+        _records_cache['spans'] = spans
+        _records_cache['rows'] = {id(record): i for i, record in enumerate(records)}
+        by_date = sorted(reversed(records), key=lambda record: _date_key(record.日期))
+        _records_cache['by_date'] = by_date
+        _records_cache['dates'] = [_date_key(record.日期) for record in by_date]
+        _records_cache['arrays'] = None # 統計用陣列在第一次需要時才建立
         return records
     except FileNotFoundError:
+        invalidate_records_cache()
         return [] 
     except Exception as e:
+        # 丟棄舊的快取，避免之後的範圍查詢與統計繼續使用過期的資料
+        invalidate_records_cache()
         messagebox.showerror("錯誤", f"讀取檔案時發生錯誤: {e}")
         return []
 
+def find_record_span(record):
+    """
+    回傳 read_records() 所回傳的某筆紀錄在 CSV 中的 (起點, 終點) 位元組位置。
+    若該紀錄不在目前的快取中，或檔案在讀取後已被修改，則回傳 None。
+    """
+    rows = _records_cache['rows']
+    index = rows.get(id(record)) if rows else None
+    if index is None or _records_cache['data'][index] is not record:
+        return None
+    try:
+        if _csv_file_key() != _records_cache['key']:
+            return None
+    except OSError:
+        return None
+    return _records_cache['spans'][index]
+
+def records_in_range(start=None, end=None):
+    """
+    回傳日期落在 [start, end] 之間的紀錄 (未指定則不限制)，依日期由新到舊排列。
+    利用快取中依日期排序的列表以 bisect 找出範圍，不需逐筆比較或重新排序。
+    只查詢目前的快取，呼叫前請先呼叫 read_records()。
+    """
+    by_date = _records_cache['by_date']
+    if by_date is None:
+        return []
+    lo, hi = _date_range_bounds(start, end)
+    return by_date[lo:hi][::-1]
+
+def arrays_in_range(start=None, end=None):
+    """
+    與 records_in_range() 相同的範圍，但回傳 (月份, 類型, 類別, 金額) 四個 NumPy 陣列 (同 records_to_arrays())。
+    陣列依日期排序後整份快取，每次篩選只取切片 (不複製資料)，不需重新逐筆轉換。
+    只查詢目前的快取，呼叫前請先呼叫 read_records()。
+    """
+    by_date = _records_cache['by_date']
+    if by_date is None:
+        return records_to_arrays([])
+    arrays = _records_cache['arrays']
+    if arrays is None:
+        arrays = _records_cache['arrays'] = records_to_arrays(by_date)
+    lo, hi = _date_range_bounds(start, end)
+    return tuple(a[lo:hi][::-1] for a in arrays)
+
+def _date_range_bounds(start, end):
+    """以 bisect 在快取的日期列表中找出 [start, end] 的索引範圍 (lo, hi)"""
+    dates = _records_cache['dates']
+    lo = bisect.bisect_left(dates, start) if start else 0
+    hi = bisect.bisect_right(dates, end) if end else len(dates)
+    return lo, hi
+
 def append_record_to_csv(record_data):
     """將單筆紀錄附加到 CSV 檔案"""
     try:
-        with open(CSV_FILE, 'a', encoding='utf-8', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(record_data)
+        record = Record._make(record_data)
+        record = record._replace(金額=float(record.金額))
+        line = _encode_csv_row(record)
+        # 快取仍對應目前檔案時，直接把新紀錄補進快取，不需重新解析
+        cache_valid = _records_cache['key'] is not None and _records_cache['key'] == _csv_file_key()
+        with open(CSV_FILE, 'ab') as file:
+            start = file.seek(0, os.SEEK_END)
+            file.write(line)
+        if cache_valid:
+            _add_record_to_cache(record, (start, start + len(line)))
+        else:
+            invalidate_records_cache()
         return True
     except Exception as e:
         messagebox.showerror("錯誤", f"寫入檔案時發生錯誤: {e}")
         return False
 
+def write_all_records(records):
+    """
+    將標頭與所有紀錄先組成一個字串，以 64KB 緩衝區單次寫入暫存檔，
+    再以 os.replace 原子性地取代 CSV，寫入中途失敗也不會留下不完整的檔案。
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADERS)
+    writer.writerows(records)
+    tmp_path = CSV_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='', buffering=65536) as file:
+        file.write(buf.getvalue())
+    os.replace(tmp_path, CSV_FILE)
+    invalidate_records_cache()
+
+def _add_record_to_cache(record, span):
+    """將剛附加到檔案尾端的紀錄加入快取，並以 bisect 插入依日期排序的列表"""
+    records = _records_cache['data']
+    _records_cache['rows'][id(record)] = len(records)
+    records.append(record)
+    _records_cache['spans'].append(span)
+    # 同日期者新紀錄排在前面，與 read_records() 的排序規則一致
+    date = _date_key(record.日期)
+    pos = bisect.bisect_left(_records_cache['dates'], date)
+    _records_cache['dates'].insert(pos, date)
+    _records_cache['by_date'].insert(pos, record)
+    arrays = _records_cache['arrays']
+    if arrays is not None:
+        import numpy as np
+
+        # 統計用陣列在同一位置插入新值 (concatenate 會自動加寬字串欄位)，不需從紀錄重建
+        values = records_to_arrays([record])
+        _records_cache['arrays'] = tuple(np.concatenate((a[:pos], v, a[pos:])) for a, v in zip(arrays, values))
+    _records_cache['key'] = _csv_file_key()
+
+def _find_csv_line(mm, line):
+    """在 mmap 中尋找內容完全等於 line 的一行，回傳含換行字元的 (起點, 終點)；找不到則回傳 None"""
+    pattern = b'\n' + line
+    pos = mm.find(pattern)
+    while pos != -1:
+        start = pos + 1
+        end = start + len(line)
+        if end == len(mm) or mm[end:end + 1] in (b'\n', b'\r'):
+            newline = mm.find(b'\n', end)
+            return start, len(mm) if newline == -1 else newline + 1
+        pos = mm.find(pattern, pos + 1)
+    return None
+
+def _encode_csv_row(record, lineterminator='\r\n'):
+    """
+    將一筆紀錄依 HEADERS 的欄位順序編碼為 CSV 一行的位元組。
+    預設使用與 csv.writer 相同的 '\r\n'。
+    """
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator=lineterminator).writerow(record)
+    return buf.getvalue().encode('utf-8')
+
+def replace_csv_span(span, record=None):
+    """
+    以 record 編碼後的一行取代 CSV 中 span 範圍內的位元組 (不傳入 record 即為刪除)，
+    其餘內容原封不動，寫入暫存檔後以 os.replace 取代原檔。
+    新的一行沿用被取代那一行的換行字元，LF 與 CRLF 的檔案改寫後都不會混用；原本沒有換行字元時使用 '\r\n'。
+    """
+    start, end = span
+    tmp_path = CSV_FILE + '.tmp'
+    with open(CSV_FILE, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            new_bytes = b''
+            if record is not None:
+                old_line = mm[start:end]
+                lineterminator = '\n' if old_line.endswith(b'\n') and not old_line.endswith(b'\r\n') else '\r\n'
+                new_bytes = _encode_csv_row(record, lineterminator)
+            with open(tmp_path, 'wb', buffering=65536) as out:
+                out.write(mm[:start])
+                out.write(new_bytes)
+                out.write(mm[end:])
+    os.replace(tmp_path, CSV_FILE)
+    invalidate_records_cache()
+
+def delete_record_from_csv(record):
+    """
+    直接在 CSV 的原始位元組中找到該筆紀錄所在的行並移除，不需解析整個檔案。
+    找不到完全相同的行時回傳 False，由呼叫端改用完整重寫的方式處理。
+    """
+    line = _encode_csv_row(record, lineterminator='')
+
+    with open(CSV_FILE, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            span = _find_csv_line(mm, line)
+    if span is None:
+        return False
+    replace_csv_span(span)
+    return True
+
+# 統計陣列中類型欄位的整數代碼，篩選收入/支出時比較 int8 而非字串
+TYPE_OTHER, TYPE_INCOME, TYPE_EXPENSE = 0, 1, 2
+_TYPE_CODES = {'收入': TYPE_INCOME, '支出': TYPE_EXPENSE}
+
+def records_to_arrays(records):
+    """
+    將紀錄列表轉為 (月份, 類型, 類別, 金額) 四個 NumPy 陣列，供統計以向量化運算處理。
+    月份使用固定寬度字串 (U7)，類型轉為 int8 代碼 (TYPE_INCOME/TYPE_EXPENSE)，金額使用 float64：
+    float32 只有約 7 位有效數字，超過十幾萬元的金額加總就會算錯角分。
+    """
+    import numpy as np
+
+    count = len(records)
+    months = np.fromiter((_date_key(r.日期)[:7] for r in records), dtype='U7', count=count)
+    types = np.fromiter((_TYPE_CODES.get(r.類型, TYPE_OTHER) for r in records), dtype=np.int8, count=count)
+    categories = np.array([r.類別 for r in records], dtype=str)
+    amounts = np.fromiter((r.金額 for r in records), dtype=np.float64, count=count)
+    return months, types, categories, amounts
+
+def summarize_arrays(arrays):
+    """
+    一次算出所有 UI 需要的統計結果 (總覽、月份總覽、圓餅圖、長條圖共用)，
+    各元件只需顯示這些小型彙總，不必各自再掃描一次紀錄。
+    arrays 為 arrays_in_range() 的結果 (依日期由新到舊排列)；回傳 dict：
+    months (由舊到新)、incomes、expenses 為各月收支 (後兩者為 NumPy 陣列，可直接交給 ax.bar)，
+    categories、category_totals 為各支出類別的總額 (後者為 NumPy 陣列，可直接交給 ax.pie)，
+    total_income、total_expense 為總計，count 為紀錄筆數。
+    """
+    import numpy as np
+
+    months, types, categories, amounts = arrays
+    incomes = np.where(types == TYPE_INCOME, amounts, 0.0)
+    expense_mask = types == TYPE_EXPENSE
+    expenses = np.where(expense_mask, amounts, 0.0)
+
+    # 紀錄已依日期排序，同月份必定相鄰：翻轉為由舊到新後找出月份交界，
+    # 以 np.add.reduceat 一次加總各月收入與支出，不需再排序分組
+    months, incomes, expenses = months[::-1], incomes[::-1], expenses[::-1]
+    starts = np.flatnonzero(months[1:] != months[:-1]) + 1
+    if len(months):
+        starts = np.concatenate(([0], starts))
+    # 支出類別同樣以 np.unique + bincount 分組加總 (等同排序後 np.add.reduceat)，不逐筆更新 dict
+    unique_categories, category_index = np.unique(categories[expense_mask], return_inverse=True)
+
+    return {
+        'count': len(amounts),
+        'months': months[starts].tolist(),
+        'incomes': np.add.reduceat(incomes, starts),
+        'expenses': np.add.reduceat(expenses, starts),
+        'categories': unique_categories.tolist(),
+        'category_totals': np.bincount(category_index, weights=amounts[expense_mask], minlength=len(unique_categories)),
+        'total_income': float(incomes.sum()),
+        'total_expense': float(expenses.sum()),
+    }
+
+@lru_cache(maxsize=32)
+def _summarize_range_cached(file_key, start, end):
+    """以 (檔案快取鍵, 篩選範圍) 為鍵快取 summarize_arrays() 的結果"""
+    return summarize_arrays(arrays_in_range(start, end))
+
+def summarize_range(start=None, end=None):
+    """
+    回傳日期範圍 [start, end] 的統計結果 (同 summarize_arrays())。
+    檔案未變動且篩選條件相同時直接回傳快取，呼叫端請勿修改回傳的內容。
+    只使用目前的快取，呼叫前請先呼叫 read_records()。
+    """
+    return _summarize_range_cached(_records_cache['key'], start, end)
+
 # --- 編輯紀錄視窗 ---
 class EditRecordWindow(tk.Toplevel):
     def __init__(self, parent, record_to_edit, categories, callback):
@@ -153,34 +600,33 @@ class EditRecordWindow(tk.Toplevel):
         if CALENDAR_ENABLED:
             self.date_entry = DateEntry(frame, date_pattern='y-mm-dd')
             try:
-                date_obj = datetime.datetime.strptime(self.original_record['日期'], '%Y-%m-%d')
-                self.date_entry.set_date(date_obj)
-            except (ValueError, KeyError):
+                self.date_entry.set_date(parse_date(self.original_record.日期))
+            except ValueError:
                 pass # DateEntry will default to today if parsing fails
         else:
             self.date_entry = ttk.Entry(frame)
-            self.date_entry.insert(0, self.original_record['日期'])
+            self.date_entry.insert(0, self.original_record.日期)
         self.date_entry.grid(row=0, column=1, sticky=tk.EW, padx=5, pady=5)
 
         ttk.Label(frame, text="類型:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
         self.type_combobox = ttk.Combobox(frame, values=['支出', '收入'], state="readonly")
         self.type_combobox.grid(row=1, column=1, sticky=tk.EW, padx=5, pady=5)
-        self.type_combobox.set(self.original_record['類型'])
+        self.type_combobox.set(self.original_record.類型)
 
         ttk.Label(frame, text="類別:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
         self.category_combobox = ttk.Combobox(frame, values=categories)
         self.category_combobox.grid(row=2, column=1, sticky=tk.EW, padx=5, pady=5)
-        self.category_combobox.set(self.original_record['類別'])
+        self.category_combobox.set(self.original_record.類別)
 
         ttk.Label(frame, text="金額:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=5)
         self.amount_entry = ttk.Entry(frame)
         self.amount_entry.grid(row=3, column=1, sticky=tk.EW, padx=5, pady=5)
-        self.amount_entry.insert(0, self.original_record['金額'])
+        self.amount_entry.insert(0, self.original_record.金額)
 
         ttk.Label(frame, text="備註:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
         self.note_entry = ttk.Entry(frame)
         self.note_entry.grid(row=4, column=1, sticky=tk.EW, padx=5, pady=5)
-        self.note_entry.insert(0, self.original_record['備註'])
+        self.note_entry.insert(0, self.original_record.備註)
         
         button_frame = ttk.Frame(frame)
         button_frame.grid(row=5, columnspan=2, pady=20)
@@ -207,46 +653,28 @@ class EditRecordWindow(tk.Toplevel):
             messagebox.showwarning("輸入錯誤", "日期、類型、類別和金額為必填項。", parent=self)
             return
         try:
-            datetime.datetime.strptime(new_date, '%Y-%m-%d')
+            _parse_ymd(new_date)
         except ValueError:
             messagebox.showwarning("輸入錯誤", "日期格式錯誤，請使用 YYYY-MM-DD。", parent=self)
             return
-        try:
-            new_amount = float(new_amount_str)
-            if new_amount <= 0:
-                messagebox.showwarning("輸入錯誤", "金額必須是正數。", parent=self)
-                return
-        except ValueError:
+        new_amount = parse_amount(new_amount_str)
+        if new_amount is None:
             messagebox.showwarning("輸入錯誤", "金額必須是有效的數字。", parent=self)
             return
+        if new_amount <= 0:
+            messagebox.showwarning("輸入錯誤", "金額必須是正數。", parent=self)
+            return
 
-        new_record = {
-            '日期': new_date,
-            '類型': new_type,
-            '類別': new_category,
-            '金額': new_amount,
-            '備註': new_note
-        }
+        new_record = Record(new_date, new_type, new_category, new_amount, new_note, '')
         
         try:
-            all_records = read_records()
-            updated_records = []
-            found = False
-            for record in all_records:
-                if record == self.original_record and not found:
-                    updated_records.append(new_record)
-                    found = True
-                else:
-                    updated_records.append(record)
-
-            if not found:
+            # 原始紀錄來自快取時直接改寫該列；否則退回逐筆比對並重寫整個檔案
+            span = find_record_span(self.original_record)
+            if span is not None:
+                replace_csv_span(span, new_record)
+            elif not self._update_record_by_rewrite(new_record):
                 messagebox.showerror("錯誤", "找不到原始紀錄，無法更新。", parent=self)
                 return
-
-            with open(CSV_FILE, 'w', encoding='utf-8', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=HEADERS)
-                writer.writeheader()
-                writer.writerows(updated_records)
             
             messagebox.showinfo("成功", "紀錄已成功更新！", parent=self.master)
             self.callback() # 觸發主視窗的更新
@@ -255,6 +683,24 @@ class EditRecordWindow(tk.Toplevel):
         except Exception as e:
             messagebox.showerror("更新錯誤", f"更新過程中發生錯誤: {e}", parent=self)
     
+    def _update_record_by_rewrite(self, new_record):
+        """讀取所有紀錄並重寫 CSV 以更新原始紀錄，回傳是否找到該紀錄"""
+        all_records = read_records()
+        updated_records = []
+        found = False
+        for record in all_records:
+            if record == self.original_record and not found:
+                updated_records.append(new_record)
+                found = True
+            else:
+                updated_records.append(record)
+
+        if not found:
+            return False
+
+        write_all_records(updated_records)
+        return True
+
     def cancel(self):
         self.destroy()
 
@@ -269,7 +715,7 @@ class CategoryMaintenanceWindow(tk.Toplevel):
         self.callback = callback
 
         # --- 內部資料 ---
-        self.categories = load_categories()
+        self.categories = list(load_categories()) # 複製一份可修改的列表 (已排序，之後以 bisect 維持順序)
 
         # --- UI 元件 ---
         frame = ttk.Frame(self, padding="10")
@@ -313,10 +759,9 @@ class CategoryMaintenanceWindow(tk.Toplevel):
         self.wait_window()
 
     def refresh_listbox(self):
-        """重新整理 Listbox 中的內容"""
+        """重新整理 Listbox 中的內容 (僅用於初次填充，新增/刪除時改為逐項更新)"""
         self.category_listbox.delete(0, tk.END)
-        for category in sorted(self.categories):
-            self.category_listbox.insert(tk.END, category)
+        self.category_listbox.insert(tk.END, *self.categories)
 
     def add_category(self):
         """新增一個類別"""
@@ -324,12 +769,14 @@ class CategoryMaintenanceWindow(tk.Toplevel):
         if not new_cat:
             messagebox.showwarning("輸入錯誤", "類別名稱不可為空。", parent=self)
             return
-        if new_cat in self.categories:
+        idx = bisect.bisect_left(self.categories, new_cat)
+        if idx < len(self.categories) and self.categories[idx] == new_cat:
             messagebox.showwarning("輸入錯誤", "這個類別已經存在。", parent=self)
             return
         
-        self.categories.append(new_cat)
-        self.refresh_listbox()
+        # 插入排序後的位置，Listbox 只需插入這一項
+        self.categories.insert(idx, new_cat)
+        self.category_listbox.insert(idx, new_cat)
         self.new_category_entry.delete(0, tk.END)
 
     def delete_category(self):
@@ -339,12 +786,14 @@ class CategoryMaintenanceWindow(tk.Toplevel):
             messagebox.showwarning("操作失敗", "請先從列表中選擇一個要刪除的類別。", parent=self)
             return
         
-        selected_category = self.category_listbox.get(selected_indices[0])
+        idx = selected_indices[0]
+        selected_category = self.category_listbox.get(idx)
         
         confirm = messagebox.askyesno("確認刪除", f"您確定要刪除 '{selected_category}' 這個類別嗎？\n(注意：這不會影響已存在的紀錄)", parent=self)
         if confirm:
-            self.categories.remove(selected_category)
-            self.refresh_listbox()
+            # Listbox 與 self.categories 的順序一致，直接以索引移除
+            self.categories.pop(idx)
+            self.category_listbox.delete(idx)
 
     def save_and_close(self):
         """儲存變更並關閉視窗"""
@@ -363,11 +812,12 @@ class AccountingApp:
         self.root = root
         self.root.title("全功能記帳系統")
         self.root.geometry("1280x768")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # --- 初始化與設定 ---
-        set_chinese_font()
         self.ensure_invoice_dir_exists() # 確保發票資料夾存在
-        migrate_csv_if_needed()
+        if not os.path.exists(MIGRATED_SENTINEL):
+            migrate_csv_if_needed()
         init_csv()
         
         # --- 資料變數 ---
@@ -377,6 +827,14 @@ class AccountingApp:
         self.categories = []
         self.current_invoice_path = None # 用於保存當前附加的圖片路徑
         self.attached_image_var = tk.StringVar(value="圖片: 無")
+        self._row_index = {} # Treeview 的 iid -> 對應的紀錄
+        self._chart_executor = ThreadPoolExecutor(max_workers=1) # 背景繪製圖表
+        self._file_executor = ThreadPoolExecutor(max_workers=1) # 背景複製附加的圖片
+        self._invoice_copy = None # 尚未完成的圖片複製
+        self._chart_generation = {'pie': 0, 'bar': 0} # 用來丟棄過期的繪圖結果
+        self._chart_request = {'pie': None, 'bar': None} # 目前顯示的圖表 (render, *args)，大小改變時用來重繪
+        self._chart_drawn_size = {'pie': None, 'bar': None} # 目前圖表點陣化時的大小
+        self._chart_resize_job = {'pie': None, 'bar': None} # 尚未執行的重繪 (after id)
         
         # --- 整體佈局 ---
         main_paned_window = ttk.PanedWindow(root, orient=tk.VERTICAL)
@@ -394,11 +852,12 @@ class AccountingApp:
 
         self.pie_chart_frame = ttk.Frame(self.chart_notebook)
         self.chart_notebook.add(self.pie_chart_frame, text='支出圓餅圖')
-        self.pie_canvas_widget = None
+        # 圖表與「無資料」訊息共用同一個 Label，更新時只切換內容，不重建元件
+        self.pie_canvas_widget = self._create_chart_label(self.pie_chart_frame, 'pie')
 
         self.bar_chart_frame = ttk.Frame(self.chart_notebook)
         self.chart_notebook.add(self.bar_chart_frame, text='收支趨勢長條圖')
-        self.bar_canvas_widget = None
+        self.bar_canvas_widget = self._create_chart_label(self.bar_chart_frame, 'bar')
 
         # --- 月份總覽 Tab ---
         self.monthly_summary_frame = ttk.Frame(self.chart_notebook)
@@ -520,7 +979,15 @@ class AccountingApp:
         self.tree.pack(fill='both', expand=True)
         
         # --- 初始資料載入 ---
-        self.filter_and_refresh_data()
+        # 等主視窗顯示後再載入資料與繪圖；matplotlib 由繪圖執行緒先行匯入並預熱字體快取
+        self._chart_executor.submit(warm_up_matplotlib)
+        self.root.after_idle(self.filter_and_refresh_data)
+
+    def on_close(self):
+        """關閉主視窗前釋放背景執行緒資源"""
+        self._chart_executor.shutdown(wait=False, cancel_futures=True)
+        self._file_executor.shutdown(wait=False) # 讓進行中的圖片複製完成，避免留下不完整的檔案
+        self.root.destroy()
 
     def ensure_invoice_dir_exists(self):
         """檢查並建立存放發票圖片的資料夾"""
@@ -546,23 +1013,13 @@ class AccountingApp:
 
         self.monthly_summary_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-    def update_monthly_summary_view(self, records):
-        """更新月份總覽表格的內容"""
+    def update_monthly_summary_view(self, summary):
+        """更新月份總覽表格的內容 (summary 為 summarize_arrays() 的結果)"""
         # 清除舊資料
-        for item in self.monthly_summary_tree.get_children():
-            self.monthly_summary_tree.delete(item)
-
-        monthly_summary = defaultdict(lambda: {'收入': 0, '支出': 0})
-        for record in records:
-            month = record['日期'][:7]  # YYYY-MM
-            monthly_summary[month][record['類型']] += record['金額']
+        self.monthly_summary_tree.delete(*self.monthly_summary_tree.get_children())
 
         # 根據月份排序 (最新的在最上面)
-        sorted_months = sorted(monthly_summary.keys(), reverse=True)
-
-        for month in sorted_months:
-            income = monthly_summary[month]['收入']
-            expense = monthly_summary[month]['支出']
+        for month, income, expense in zip(reversed(summary['months']), summary['incomes'][::-1].tolist(), summary['expenses'][::-1].tolist()):
             balance = income - expense
             
             # 格式化為貨幣字串
@@ -582,38 +1039,32 @@ class AccountingApp:
         start_date_str = self.start_date_entry.get().strip()
         end_date_str = self.end_date_entry.get().strip()
         
-        all_records = read_records()
-        filtered_records = []
-
         try:
-            start_date = datetime.datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else None
-            end_date = datetime.datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+            start_date = parse_date(start_date_str) if start_date_str else None
+            end_date = parse_date(end_date_str) if end_date_str else None
 
             if start_date and end_date and start_date > end_date:
                 messagebox.showwarning("日期錯誤", "開始日期不能晚於結束日期。")
                 return
 
-            if not start_date and not end_date:
-                filtered_records = all_records
-            else:
-                for record in all_records:
-                    record_date = datetime.datetime.strptime(record['日期'], '%Y-%m-%d').date()
-                    if start_date and record_date < start_date:
-                        continue
-                    if end_date and record_date > end_date:
-                        continue
-                    filtered_records.append(record)
-
         except ValueError:
             messagebox.showwarning("格式錯誤", "日期格式錯誤，請使用 YYYY-MM-DD。")
-            filtered_records = all_records # 格式錯誤時顯示全部
+            start_date = end_date = None # 格式錯誤時顯示全部
+
+        # 以正規化的 'YYYY-MM-DD' 字串做範圍比較，紀錄本身的日期不需逐筆解析
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        read_records() # 每次更新只檢查/解析檔案一次，以下都使用同一份快取
+        filtered_records = records_in_range(start, end)
+        # 所有統計只計算一次，各元件直接顯示結果
+        summary = summarize_range(start, end)
             
         self.refresh_records_view(filtered_records)
-        self.update_summary_view(filtered_records)
+        self.update_summary_view(summary)
         self.update_categories()
-        self.plot_pie(filtered_records)
-        self.plot_bar_chart(filtered_records)
-        self.update_monthly_summary_view(filtered_records) # 更新月份總覽
+        self.plot_pie(summary)
+        self.plot_bar_chart(summary)
+        self.update_monthly_summary_view(summary) # 更新月份總覽
 
     def clear_filter_and_refresh(self):
         """清除日期篩選並重新整理"""
@@ -621,10 +1072,10 @@ class AccountingApp:
         self.end_date_entry.delete(0, tk.END)
         self.filter_and_refresh_data()
         
-    def update_summary_view(self, records):
-        """更新總收入、總支出和結餘的顯示"""
-        total_income = sum(r['金額'] for r in records if r['類型'] == '收入')
-        total_expense = sum(r['金額'] for r in records if r['類型'] == '支出')
+    def update_summary_view(self, summary):
+        """更新總收入、總支出和結餘的顯示 (summary 為 summarize_arrays() 的結果)"""
+        total_income = summary['total_income']
+        total_expense = summary['total_expense']
         balance = total_income - total_expense
         
         self.total_income_var.set(f"總收入: {total_income:,.2f}")
@@ -632,13 +1083,13 @@ class AccountingApp:
         self.balance_var.set(f"結餘: {balance:,.2f}")
 
     def build_record_from_values(self, values):
-        """從 treeview 的 values 列表中建立一個 record 字典"""
-        record = dict(zip(HEADERS, values))
+        """從 treeview 的 values 列表中建立一個 Record"""
+        values = (list(values) + [''] * len(HEADERS))[:len(HEADERS)]
         try:
-            record['金額'] = float(record['金額'])
-        except (ValueError, KeyError):
-            record['金額'] = 0.0
-        return record
+            values[3] = float(values[3])
+        except ValueError:
+            values[3] = 0.0
+        return Record._make(values)
 
     def edit_record(self):
         """開啟一個新視窗來編輯選定的紀錄"""
@@ -648,8 +1099,10 @@ class AccountingApp:
             return
         
         selected_item = selected_items[0]
-        record_values = self.tree.item(selected_item, 'values')
-        record_to_edit = self.build_record_from_values(record_values)
+        record_to_edit = self._row_index.get(selected_item)
+        if record_to_edit is None:
+            record_values = self.tree.item(selected_item, 'values')
+            record_to_edit = self.build_record_from_values(record_values)
         
         EditRecordWindow(self.root, record_to_edit, self.categories, self.filter_and_refresh_data)
 
@@ -668,40 +1121,29 @@ class AccountingApp:
             return
 
         try:
-            all_records = read_records()
-            record_to_delete_dict = self.build_record_from_values(record_values_to_delete)
-
-            updated_records = []
-            found = False
-            for record in all_records:
-                # 比較時要確保類型一致，並處理圖片欄位可能不存在的舊資料
-                if record['日期'] == record_to_delete_dict['日期'] and \
-                   record['類型'] == record_to_delete_dict['類型'] and \
-                   record['類別'] == record_to_delete_dict['類別'] and \
-                   float(record['金額']) == float(record_to_delete_dict['金額']) and \
-                   record['備註'] == record_to_delete_dict['備註'] and \
-                   record.get('圖片', '') == record_to_delete_dict.get('圖片', '') and \
-                   not found:
-                    found = True
-                    # 刪除對應的圖片檔案
-                    if record_to_delete_dict.get('圖片'):
-                        try:
-                            os.remove(record_to_delete_dict['圖片'])
-                        except OSError as e:
-                            print(f"刪除圖片失敗: {e}")
-                    continue
-                updated_records.append(record)
-            
+            record_to_delete_dict = self._row_index.get(selected_item)
+            span = find_record_span(record_to_delete_dict) if record_to_delete_dict is not None else None
+            if span is not None:
+                # 直接移除該列所在的位元組範圍
+                replace_csv_span(span)
+                found = True
+            else:
+                # 快取已失效：先嘗試在檔案位元組中尋找相同的行，失敗時才退回完整重寫
+                record_to_delete_dict = self.build_record_from_values(record_values_to_delete)
+                found = delete_record_from_csv(record_to_delete_dict)
+                if not found:
+                    found = self._delete_record_by_rewrite(record_to_delete_dict)
+
             if not found:
                 messagebox.showerror("錯誤", "在檔案中找不到對應的紀錄，無法刪除。")
                 return
 
-            with open(CSV_FILE, 'w', encoding='utf-8', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=HEADERS)
-                writer.writeheader()
-                for rec in updated_records:
-                    rec['金額'] = str(rec.get('金額', 0.0))
-                    writer.writerow(rec)
+            # 刪除對應的圖片檔案
+            if record_to_delete_dict.圖片:
+                try:
+                    os.remove(record_to_delete_dict.圖片)
+                except OSError as e:
+                    print(f"刪除圖片失敗: {e}")
 
             messagebox.showinfo("成功", "紀錄已成功刪除！")
             self.filter_and_refresh_data()
@@ -709,6 +1151,30 @@ class AccountingApp:
         except Exception as e:
             messagebox.showerror("刪除錯誤", f"刪除過程中發生錯誤: {e}")
 
+    def _delete_record_by_rewrite(self, record_to_delete_dict):
+        """讀取所有紀錄並重寫 CSV 以刪除指定紀錄，回傳是否找到該紀錄"""
+        all_records = read_records()
+        updated_records = []
+        found = False
+        for record in all_records:
+            # 比較時要確保類型一致
+            if record.日期 == record_to_delete_dict.日期 and \
+               record.類型 == record_to_delete_dict.類型 and \
+               record.類別 == record_to_delete_dict.類別 and \
+               float(record.金額) == float(record_to_delete_dict.金額) and \
+               record.備註 == record_to_delete_dict.備註 and \
+               record.圖片 == record_to_delete_dict.圖片 and \
+               not found:
+                found = True
+                continue
+            updated_records.append(record)
+
+        if not found:
+            return False
+
+        write_all_records(updated_records)
+        return True
+
     def view_attached_image(self):
         """開啟選定紀錄所附加的圖片"""
         selected_items = self.tree.selection()
@@ -737,14 +1203,18 @@ class AccountingApp:
             messagebox.showerror("開啟失敗", f"無法開啟圖片檔案: {e}")
 
     def refresh_records_view(self, records):
-        """使用給定的紀錄列表重新整理 Treeview"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """使用給定的紀錄列表 (已依日期由新到舊排列) 重新整理 Treeview"""
+        self.tree.delete(*self.tree.get_children()) # 一次呼叫清除所有列
+        self._row_index = {}
         
-        # 根據日期排序，最新的在最上面
-        for record in sorted(records, key=lambda r: r['日期'], reverse=True):
-            values = [record.get(h, '') for h in HEADERS]
-            self.tree.insert('', tk.END, values=values)
+        # 紀錄已依日期由新到舊排列，最新的在最上面
+        # 直接呼叫 Tcl 的 insert 指令，略過 ttk.Treeview.insert 每列整理選項字典的開銷；
+        # Record 是 tuple，會直接轉為 Tcl list 作為 -values
+        call = self.tree.tk.call
+        widget = self.tree._w
+        row_index = self._row_index
+        for record in records:
+            row_index[call(widget, 'insert', '', 'end', '-values', record)] = record
 
     def save_new_record(self):
         """從 GUI 輸入儲存新紀錄，包含圖片路徑"""
@@ -755,22 +1225,24 @@ class AccountingApp:
         note = self.note_entry.get().strip()
         image_path = self.current_invoice_path if self.current_invoice_path else ''
 
+        if self._invoice_copy is not None:
+            messagebox.showwarning("請稍候", "附加的圖片仍在複製中，請稍後再儲存。")
+            return
         if not (date_str and record_type and category and amount_str):
             messagebox.showwarning("輸入錯誤", "日期、類型、類別和金額為必填項。")
             return
         try:
-            datetime.datetime.strptime(date_str, '%Y-%m-%d')
+            _parse_ymd(date_str)
         except ValueError:
             messagebox.showwarning("輸入錯誤", "日期格式錯誤，請使用 YYYY-MM-DD。")
             return
-        try:
-            amount = float(amount_str)
-            if amount <= 0:
-                messagebox.showwarning("輸入錯誤", "金額必須是正數。")
-                return
-        except ValueError:
+        amount = parse_amount(amount_str)
+        if amount is None:
             messagebox.showwarning("輸入錯誤", "金額必須是有效的數字。")
             return
+        if amount <= 0:
+            messagebox.showwarning("輸入錯誤", "金額必須是正數。")
+            return
 
         record_data = [date_str, record_type, category, amount, note, image_path]
         if append_record_to_csv(record_data):
@@ -800,108 +1272,154 @@ class AccountingApp:
 
         try:
             # 建立一個獨特的檔案名稱
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.datetime.now()
+            timestamp = f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
             original_filename = os.path.basename(source_path)
             new_filename = f"{timestamp}_{original_filename}"
             
             dest_path = os.path.join(INVOICE_DIR, new_filename)
             
-            # 複製檔案
-            shutil.copy(source_path, dest_path)
-            
-            # 記錄相對路徑並更新UI
-            self.current_invoice_path = dest_path
-            self.attached_image_var.set(f"圖片: {new_filename}")
-            messagebox.showinfo("上傳成功", f"圖片 '{original_filename}' 已附加。")
+            # 在背景執行緒複製檔案，大圖片也不會卡住介面
+            # (shutil.copyfile 在 Linux 使用 sendfile，在 Windows 使用 1MB 緩衝區)
+            self.current_invoice_path = None
+            self.attached_image_var.set(f"圖片: {new_filename} (複製中...)")
+            future = self._file_executor.submit(shutil.copyfile, source_path, dest_path)
+            self._invoice_copy = future
+            self.root.after(INVOICE_COPY_POLL_MS, self._finish_invoice_copy, future, dest_path, new_filename, original_filename)
 
         except Exception as e:
             messagebox.showerror("上傳失敗", f"處理圖片時發生錯誤: {e}")
             self.current_invoice_path = None
             self.attached_image_var.set("圖片: 無")
 
-    def _clear_chart_canvas(self, canvas_type):
-        """清除指定的圖表畫布"""
-        if canvas_type == 'pie' and self.pie_canvas_widget:
-            self.pie_canvas_widget.destroy()
-            self.pie_canvas_widget = None
-        elif canvas_type == 'bar' and self.bar_canvas_widget:
-            self.bar_canvas_widget.destroy()
-            self.bar_canvas_widget = None
-
-    def plot_pie(self, records):
-        """在 GUI 中使用給定的紀錄繪製圓餅圖 (僅支出)"""
-        self._clear_chart_canvas('pie')
-        
-        expense_records = [r for r in records if r.get('類型') == '支出']
-        
-        if not expense_records:
-            no_data_label = ttk.Label(self.pie_chart_frame, text="沒有任何支出紀錄可供繪製圖表。", font=("Helvetica", 14))
-            no_data_label.pack(expand=True)
-            self.pie_canvas_widget = no_data_label
+    def _finish_invoice_copy(self, future, dest_path, new_filename, original_filename):
+        """背景複製完成後記錄圖片路徑並更新 UI"""
+        if future is not self._invoice_copy:
+            return # 已改選其他圖片
+        if not future.done():
+            self.root.after(INVOICE_COPY_POLL_MS, self._finish_invoice_copy, future, dest_path, new_filename, original_filename)
+            return
+        self._invoice_copy = None
+        try:
+            future.result()
+        except Exception as e:
+            messagebox.showerror("上傳失敗", f"處理圖片時發生錯誤: {e}")
+            self.current_invoice_path = None
+            self.attached_image_var.set("圖片: 無")
             return
 
-        category_summary = defaultdict(float)
-        for record in expense_records:
-            category_summary[record['類別']] += record['金額']
-        
-        fig, ax = plt.subplots(figsize=(8, 6), dpi=100)
-        ax.pie(list(category_summary.values()), labels=list(category_summary.keys()), autopct='%1.1f%%', startangle=140, textprops={'fontsize': 10})
-        ax.set_title('各類別支出圓餅圖', fontsize=16)
-        ax.axis('equal')
-        fig.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=self.pie_chart_frame)
-        canvas_tk_widget = canvas.get_tk_widget()
-        canvas_tk_widget.pack(fill=tk.BOTH, expand=True)
-        self.pie_canvas_widget = canvas_tk_widget
-        canvas.draw()
-
-    def plot_bar_chart(self, records):
-        """在 GUI 中繪製每月收支趨勢長條圖"""
-        self._clear_chart_canvas('bar')
-
-        if not records:
-            no_data_label = ttk.Label(self.bar_chart_frame, text="沒有任何紀錄可供繪製圖表。", font=("Helvetica", 14))
-            no_data_label.pack(expand=True)
-            self.bar_canvas_widget = no_data_label
+        # 記錄相對路徑並更新UI
+        self.current_invoice_path = dest_path
+        self.attached_image_var.set(f"圖片: {new_filename}")
+        messagebox.showinfo("上傳成功", f"圖片 '{original_filename}' 已附加。")
+
+    def _create_chart_label(self, frame, canvas_type):
+        """在圖表分頁中建立顯示圖表的 Label，並在分頁大小改變時重新繪製"""
+        # 圖片大小跟著分頁大小走，不讓 Label 反過來撐大分頁
+        frame.pack_propagate(False)
+        label = tk.Label(frame, font=("Helvetica", 14), borderwidth=0, highlightthickness=0)
+        label.image = None
+        label.pack(fill=tk.BOTH, expand=True)
+        frame.bind('<Configure>', lambda event: self._schedule_chart_resize(canvas_type))
+        return label
+
+    def _schedule_chart_resize(self, canvas_type):
+        """分頁大小改變 (含第一次顯示) 時延後重繪，拖曳視窗期間只會重繪一次"""
+        job = self._chart_resize_job[canvas_type]
+        if job is not None:
+            self.root.after_cancel(job)
+        self._chart_resize_job[canvas_type] = self.root.after(CHART_RESIZE_DELAY_MS, self._redraw_resized_chart, canvas_type)
+
+    def _redraw_resized_chart(self, canvas_type):
+        """以目前的分頁大小重新繪製圖表 (大小沒變或目前沒有圖表時略過)"""
+        self._chart_resize_job[canvas_type] = None
+        request = self._chart_request[canvas_type]
+        if request is None:
             return
-        
-        monthly_summary = defaultdict(lambda: {'收入': 0, '支出': 0})
-        for record in records:
-            month = record['日期'][:7] # YYYY-MM
-            monthly_summary[month][record['類型']] += record['金額']
-        
-        if not monthly_summary:
-            no_data_label = ttk.Label(self.bar_chart_frame, text="此期間無紀錄可繪製圖表。", font=("Helvetica", 14))
-            no_data_label.pack(expand=True)
-            self.bar_canvas_widget = no_data_label
+        if self._chart_size(canvas_type) != self._chart_drawn_size[canvas_type]:
+            self._render_chart_async(canvas_type, *request)
+
+    def _chart_widget(self, canvas_type):
+        """回傳顯示指定圖表的 Label"""
+        return self.pie_canvas_widget if canvas_type == 'pie' else self.bar_canvas_widget
+
+    def _show_chart_message(self, canvas_type, text):
+        """以文字訊息取代圖表，並捨棄尚未完成的背景繪圖"""
+        self._chart_generation[canvas_type] += 1
+        self._chart_request[canvas_type] = None
+        widget = self._chart_widget(canvas_type)
+        widget.configure(image='', text=text)
+        widget.image = None
+
+    def _chart_size(self, canvas_type):
+        """取得圖表分頁目前的像素大小；分頁尚未顯示時使用預設值 (顯示後會依實際大小重繪)"""
+        if canvas_type == 'pie':
+            frame, default = self.pie_chart_frame, (800, 600)
+        else:
+            frame, default = self.bar_chart_frame, (1000, 600)
+        width, height = frame.winfo_width(), frame.winfo_height()
+        if width > 1 and height > 1:
+            return (width, height)
+        return default
+
+    def _render_chart_async(self, canvas_type, render, *args):
+        """
+        依分頁目前的大小將圖表交給背景執行緒點陣化，完成後再由主執行緒換上新圖
+        (matplotlib 也在背景執行緒匯入)。render 會以 (*args, size) 呼叫。
+        """
+        self._chart_generation[canvas_type] += 1
+        generation = self._chart_generation[canvas_type]
+        size = self._chart_size(canvas_type)
+        self._chart_request[canvas_type] = (render, *args)
+        self._chart_drawn_size[canvas_type] = size
+        future = self._chart_executor.submit(render, *args, size)
+        self.root.after(CHART_POLL_MS, self._swap_chart, canvas_type, future, generation)
+
+    def _swap_chart(self, canvas_type, future, generation):
+        """背景繪圖完成後，將結果以 PhotoImage 顯示在對應的分頁中"""
+        if generation != self._chart_generation[canvas_type]:
+            return # 已有較新的繪圖要求，捨棄此結果
+        if not future.done():
+            self.root.after(CHART_POLL_MS, self._swap_chart, canvas_type, future, generation)
+            return
+        try:
+            rgba = future.result()
+        except Exception as e:
+            messagebox.showerror("繪圖錯誤", f"繪製圖表時發生錯誤: {e}")
             return
-            
-        sorted_months = sorted(monthly_summary.keys())
-        income_values = [monthly_summary[m]['收入'] for m in sorted_months]
-        expense_values = [monthly_summary[m]['支出'] for m in sorted_months]
 
-        fig, ax = plt.subplots(figsize=(10, 6), dpi=100)
+        from PIL import Image, ImageTk
 
-        bar_width = 0.35
-        x = range(len(sorted_months))
+        widget = self._chart_widget(canvas_type)
+        image = Image.fromarray(rgba)
+        photo = widget.image
+        if photo is not None and (photo.width(), photo.height()) == image.size:
+            # 大小相同時直接把新像素貼進原本的 PhotoImage，不另建 Tk 影像物件
+            photo.paste(image)
+        else:
+            photo = ImageTk.PhotoImage(image, master=widget)
+            widget.configure(image=photo, text='')
+            widget.image = photo # 保留參照，避免圖片被回收
+
+    def plot_pie(self, summary):
+        """在 GUI 中使用 summarize_arrays() 的結果繪製圓餅圖 (僅支出)"""
+        if not summary['categories']:
+            self._show_chart_message('pie', "沒有任何支出紀錄可供繪製圖表。")
+            return
         
-        ax.bar([i - bar_width/2 for i in x], income_values, bar_width, label='收入', color='g')
-        ax.bar([i + bar_width/2 for i in x], expense_values, bar_width, label='支出', color='r')
-
-        ax.set_ylabel('金額')
-        ax.set_title('每月收支趨勢圖')
-        ax.set_xticks(x)
-        ax.set_xticklabels(sorted_months, rotation=45, ha="right")
-        ax.legend()
+        self._render_chart_async('pie', render_pie_chart, summary['categories'], summary['category_totals'])
 
-        fig.tight_layout()
+    def plot_bar_chart(self, summary):
+        """在 GUI 中使用 summarize_arrays() 的結果繪製每月收支趨勢長條圖"""
+        if not summary['count']:
+            self._show_chart_message('bar', "沒有任何紀錄可供繪製圖表。")
+            return
+        
+        if not summary['months']:
+            self._show_chart_message('bar', "此期間無紀錄可繪製圖表。")
+            return
 
-        canvas = FigureCanvasTkAgg(fig, master=self.bar_chart_frame)
-        canvas_tk_widget = canvas.get_tk_widget()
-        canvas_tk_widget.pack(fill=tk.BOTH, expand=True)
-        self.bar_canvas_widget = canvas_tk_widget
-        canvas.draw()
+        self._render_chart_async('bar', render_bar_chart, summary['months'], summary['incomes'], summary['expenses'])
 
 def main():
     root = tk.Tk()